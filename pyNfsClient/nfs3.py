@@ -49,6 +49,14 @@ class NFSv3(RPC):
     def nfs_request(self, procedure, args, auth):
         return super(NFSv3, self).request(NFS_PROGRAM, NFS_V3, procedure, data=args, auth=auth)
 
+    def nfs_request_call(self, procedure, args, auth):
+        """Send a call without waiting for the reply; returns the XID."""
+        return super(NFSv3, self).send_call(NFS_PROGRAM, NFS_V3, procedure, data=args, auth=auth)
+
+    def nfs_request_reply(self, xid):
+        """Receive the reply for an XID returned by nfs_request_call."""
+        return super(NFSv3, self).recv_reply(xid)
+
     def null(self):
         logger.debug("NFSv3 procedure %d: NULL on %s" % (NFS3_PROCEDURE_NULL, self.host))
         super(NFSv3, self).request(NFS_PROGRAM, NFS_V3, NFS3_PROCEDURE_NULL)
@@ -103,16 +111,24 @@ class NFSv3(RPC):
         return unpacker.unpack_setattr3res()
 
     @fh_check
-    def lookup(self, dir_handle, file_folder, auth=None):
+    def lookup_call(self, dir_handle, file_folder, auth=None):
+        """Send a LOOKUP call without waiting for the reply; returns the XID."""
         packer = nfs_pro_v3Packer()
         packer.pack_diropargs3(diropargs3(dir=nfs_fh3(dir_handle), name=str_to_bytes(file_folder)))
 
         logger.debug("NFSv3 procedure %d: LOOKUP on %s" % (NFS3_PROCEDURE_LOOKUP, self.host))
-        data = self.nfs_request(NFS3_PROCEDURE_LOOKUP, packer.get_buffer(), auth if auth else self.auth)
+        return self.nfs_request_call(NFS3_PROCEDURE_LOOKUP, packer.get_buffer(), auth if auth else self.auth)
 
-        unpacker = nfs_pro_v3Unpacker(data)
+    def lookup_reply(self, xid):
+        """Receive and unpack the LOOKUP reply for an XID from lookup_call."""
+        unpacker = nfs_pro_v3Unpacker(self.nfs_request_reply(xid))
         return unpacker.unpack_lookup3res(data_format='json')
 
+    @fh_check
+    def lookup(self, dir_handle, file_folder, auth=None):
+        xid = self.lookup_call(dir_handle, file_folder, auth)
+        return self.lookup_reply(xid)
+
     @fh_check
     def access(self, file_handle, access_option, auth=None):
         packer = nfs_pro_v3Packer()
@@ -147,7 +163,8 @@ class NFSv3(RPC):
         return unpacker.unpack_read3res()
 
     @fh_check
-    def write(self, file_handle, offset, count, content, stable_how, auth=None):
+    def write_call(self, file_handle, offset, count, content, stable_how, auth=None):
+        """Send a WRITE call without waiting for the reply; returns the XID."""
         packer = nfs_pro_v3Packer()
         packer.pack_write3args(write3args(file=nfs_fh3(file_handle),
                                           offset=offset,
@@ -156,27 +173,47 @@ class NFSv3(RPC):
                                           data=str_to_bytes(content)))
 
         logger.debug("NFSv3 procedure %d: WRITE on %s" % (NFS3_PROCEDURE_WRITE, self.host))
-        res = self.nfs_request(NFS3_PROCEDURE_WRITE, packer.get_buffer(), auth if auth else self.auth)
+        return self.nfs_request_call(NFS3_PROCEDURE_WRITE, packer.get_buffer(), auth if auth else self.auth)
 
-        unpacker = nfs_pro_v3Unpacker(res)
+    def write_reply(self, xid):
+        """Receive and unpack the WRITE reply for an XID from write_call."""
+        unpacker = nfs_pro_v3Unpacker(self.nfs_request_reply(xid))
         return unpacker.unpack_write3res()
 
     @fh_check
-    def create(self, dir_handle, file_name, create_mode, mode=None, uid=None, gid=None, size=None,
-               atime_flag=SET_TO_SERVER_TIME, atime_s=None, atime_us=None,
-                mtime_flag=SET_TO_SERVER_TIME, mtime_s=None, mtime_us=None,
-               verf='0', auth=None):
+    def write(self, file_handle, offset, count, content, stable_how, auth=None):
+        xid = self.write_call(file_handle, offset, count, content, stable_how, auth)
+        return self.write_reply(xid)
+
+    @fh_check
+    def create_call(self, dir_handle, file_name, create_mode, mode=None, uid=None, gid=None, size=None,
+                    atime_flag=SET_TO_SERVER_TIME, atime_s=None, atime_us=None,
+                    mtime_flag=SET_TO_SERVER_TIME, mtime_s=None, mtime_us=None,
+                    verf='0', auth=None):
+        """Send a CREATE call without waiting for the reply; returns the XID."""
         packer = nfs_pro_v3Packer()
         attrs = self.get_sattr3(mode, uid, gid, size, atime_flag, atime_s, atime_us, mtime_flag, mtime_s, mtime_us)
         packer.pack_create3args(create3args(where=diropargs3(dir=nfs_fh3(dir_handle), name=str_to_bytes(file_name)),
                                             how=createhow3(mode=create_mode, obj_attributes=attrs, verf=verf)))
 
         logger.debug("NFSv3 procedure %d: CREATE on %s" % (NFS3_PROCEDURE_CREATE, self.host))
-        data = self.nfs_request(NFS3_PROCEDURE_CREATE, packer.get_buffer(), auth if auth else self.auth)
+        return self.nfs_request_call(NFS3_PROCEDURE_CREATE, packer.get_buffer(), auth if auth else self.auth)
 
-        unpacker = nfs_pro_v3Unpacker(data)
+    def create_reply(self, xid):
+        """Receive and unpack the CREATE reply for an XID from create_call."""
+        unpacker = nfs_pro_v3Unpacker(self.nfs_request_reply(xid))
         return unpacker.unpack_create3res()
 
+    @fh_check
+    def create(self, dir_handle, file_name, create_mode, mode=None, uid=None, gid=None, size=None,
+               atime_flag=SET_TO_SERVER_TIME, atime_s=None, atime_us=None,
+                mtime_flag=SET_TO_SERVER_TIME, mtime_s=None, mtime_us=None,
+               verf='0', auth=None):
+        xid = self.create_call(dir_handle, file_name, create_mode, mode, uid, gid, size,
+                               atime_flag, atime_s, atime_us, mtime_flag, mtime_s, mtime_us,
+                               verf, auth)
+        return self.create_reply(xid)
+
     @fh_check
     def mkdir(self, dir_handle, dir_name, mode=None, uid=None, gid=None,
               atime_flag=SET_TO_SERVER_TIME, atime_s=None, atime_us=None,
@@ -347,12 +384,20 @@ class NFSv3(RPC):
         return unpacker.unpack_pathconf3res()
 
     @fh_check
-    def commit(self, file_handle, count=0, offset=0, auth=None):
+    def commit_call(self, file_handle, count=0, offset=0, auth=None):
+        """Send a COMMIT call without waiting for the reply; returns the XID."""
         packer = nfs_pro_v3Packer()
         packer.pack_commit3args(commit3args(file=nfs_fh3(file_handle), offset=offset, count=count))
 
         logger.debug("NFSv3 procedure %d: COMMIT on %s" % (NFS3_PROCEDURE_COMMIT, self.host))
-        res = self.nfs_request(NFS3_PROCEDURE_COMMIT, packer.get_buffer(), auth if auth else self.auth)
+        return self.nfs_request_call(NFS3_PROCEDURE_COMMIT, packer.get_buffer(), auth if auth else self.auth)
 
-        unpacker = nfs_pro_v3Unpacker(res)
+    def commit_reply(self, xid):
+        """Receive and unpack the COMMIT reply for an XID from commit_call."""
+        unpacker = nfs_pro_v3Unpacker(self.nfs_request_reply(xid))
         return unpacker.unpack_commit3res()
+
+    @fh_check
+    def commit(self, file_handle, count=0, offset=0, auth=None):
+        xid = self.commit_call(file_handle, count, offset, auth)
+        return self.commit_reply(xid)
@@ -29,6 +29,20 @@ class nfs_pro_v3Packer(Packer):
         except struct.error as e:
             raise ConversionError(e.args[0])
 
+    def pack_fstring(self, n, s):
+        # The stock implementation slices the payload and then concatenates
+        # the XDR padding onto the slice, copying the whole buffer twice;
+        # for megabyte WRITE bodies that is two avoidable memcpys. Write
+        # the payload and its padding separately instead.
+        if n < 0:
+            raise ValueError('fstring size must be nonnegative')
+        data = s if len(s) == n else s[:n]
+        pad = ((n + 3) & ~3) - len(data)
+        buf = self._Packer__buf
+        buf.write(data)
+        if pad:
+            buf.write(b'\x00' * pad)
+
     def pack_filename3(self, data):
         self.pack_string(data)
 
@@ -1019,6 +1033,12 @@ class nfs_pro_v3Unpacker(Unpacker):
     unpack_bool = Unpacker.unpack_bool
     unpack_uint32 = unpack_uint
 
+    def unpack_fstring(self, n):
+        # The RPC layer hands over a zero-copy memoryview of the reply;
+        # materialize extracted opaque/string fields as real bytes so
+        # callers can compare, decode and reuse them as file handles.
+        return bytes(Unpacker.unpack_fstring(self, n))
+
     def unpack_uint64(self):
         i = self._Unpacker__pos
         self._Unpacker__pos = j = i + 8
@@ -74,3 +74,23 @@ class Portmap(RPC):
 
         (port,) = struct.unpack('!L', getport)
         return port
+
+    def getport_many(self, programs, getport_protocol=6):
+        """Resolve several (program, version) pairs in one pipelined batch.
+
+        The GETPORT calls are sent back to back with distinct XIDs before
+        any reply is read, so resolving N programs (e.g. mountd and nfsd
+        at startup) costs roughly one round trip instead of N. Returns the
+        ports in the same order as *programs*.
+        """
+        procedure = 3       # GetPort
+
+        xids = [self.send_call(self.program, self.program_version, procedure,
+                               data=struct.pack('!LLLL', prog, vers, getport_protocol, 0))
+                for prog, vers in programs]
+
+        ports = []
+        for xid in xids:
+            (port,) = struct.unpack('!L', self.recv_reply(xid))
+            ports.append(port)
+        return ports
@@ -1,18 +1,82 @@
+import itertools
 import logging
 import struct
 import socket
 import time
+import weakref
 from random import randint
 
 logger = logging.getLogger(__package__)
-logging.basicConfig(level=logging.CRITICAL)  # Ensure you see critical logs
+
+# Precompiled layouts for the hot RPC header/trailer fields; struct.pack
+# with a literal format re-parses the format string on every call.
+_HDR6 = struct.Struct('!LLLLLL')
+_HDR2 = struct.Struct('!LL')
+_U32 = struct.Struct('!L')
+
+# AUTH_NULL credential/verifier: flavor 0, length 0.
+_AUTH_NULL = _HDR2.pack(0, 0)
+
+
+def _encode_call(out, xid, message_type, version, program, program_version, procedure, cred, body):
+    """Encode a complete RPC call frame, fragment header included, into *out*.
+
+    Kept as a free function over plain buffers so a compiled drop-in
+    (e.g. Cython) could replace it for very high request rates without
+    touching the transport logic; the struct packing below already runs
+    at C level into a single bytearray. Clearing *out* with del retains
+    its capacity, so a reused buffer costs no allocation after warmup.
+    """
+    del out[:]
+    out.extend(b'\x00\x00\x00\x00')     # reserved for the fragment header
+    out.extend(_HDR6.pack(xid, message_type, version, program, program_version, procedure))
+    out.extend(cred)
+    out.extend(_AUTH_NULL)      # verifier
+    if body is not None:
+        out.extend(body)
+    _U32.pack_into(out, 0, 0x80000000 + len(out) - 4)
+    return out
 
 class RPCProtocolError(Exception):
     pass
 
 
 class RPC(object):
-    connections = list()
+    # Live connections only; a WeakSet lets dropped/closed instances (and
+    # the buffers they hold) be collected instead of accumulating forever
+    # in a class-level list.
+    _connections = weakref.WeakSet()
+
+    # AUTH_UNIX credential templates keyed by the fields they encode; only
+    # the stamp at offset 8 changes between requests, so the rest of the
+    # blob (name, padding, uid/gid, aux gids) is built once and patched.
+    _auth_cache = {}
+
+    # XIDs must be unique per outstanding call so pipelined replies can be
+    # matched back to their requests; a random starting point keeps streams
+    # from different client processes distinct as well.
+    _xid_counter = itertools.count(randint(1, 2 ** 31))
+
+    @classmethod
+    def _auth_unix_template(cls, auth):
+        key = (auth["machine_name"], auth["uid"], auth["gid"], tuple(auth["aux_gid"]))
+        template = cls._auth_cache.get(key)
+        if template is None:
+            name = auth["machine_name"].encode()
+            auth_data = bytearray()
+            auth_data.extend(_HDR2.pack(0, len(name)))
+            auth_data.extend(name)
+            auth_data.extend(b'\x00' * (-len(name) & 3))
+            auth_data.extend(_HDR2.pack(auth["uid"], auth["gid"]))
+            aux_gids = auth["aux_gid"]
+            if len(aux_gids) == 1 and aux_gids[0] == 0:
+                auth_data.extend(_U32.pack(0))
+            else:
+                auth_data.extend(struct.pack('!L%dL' % len(aux_gids), len(aux_gids), *aux_gids))
+            template = bytearray(_HDR2.pack(1, len(auth_data)))
+            template.extend(auth_data)
+            cls._auth_cache[key] = template
+        return template
 
     def __init__(self, host, port, timeout):
         self.host = host
@@ -20,104 +84,174 @@ class RPC(object):
         self.timeout = timeout
         self.client = None
         self.client_port = None
+        self.pending_replies = dict()
+        self._last_auth = None
+        self._last_auth_template = None
+        self._stamp = 0
+        self._stamp_refreshed = 0.0
+        # Outgoing frame buffer, reused across calls; sendall returns only
+        # after the kernel has taken the bytes, so reuse is safe.
+        self._send_buf = bytearray()
+        # While corked, outgoing frames accumulate here and leave in a
+        # single sendall on uncork.
+        self._cork_buf = None
+        # Incoming byte buffer: each recv syscall pulls as much as the
+        # kernel has, so with pipelined calls one syscall often carries
+        # several replies and the per-RPC syscall count drops below two.
+        self._rx_buf = bytearray()
+        # Fixed scratch buffer the kernel copies into via recv_into;
+        # allocated once per connection instead of a fresh bytes object
+        # per recv call.
+        self._rx_scratch = bytearray(65536)
 
-    def request(self, program, program_version, procedure, data=None, message_type=0, version=2, auth=None):
-        logger.debug(f"RPC.request: Preparing request to {self.host}:{self.port}, procedure={procedure}")
-        rpc_xid = int(time.time())
-        rpc_message_type = message_type     # 0=call
-        rpc_rpc_version = version
-        rpc_program = program
-        rpc_program_version = program_version
-        rpc_procedure = procedure
-        rpc_verifier_flavor = 0             # AUTH_NULL
-        rpc_verifier_length = 0
-
-        proto = struct.pack('!LLLLLL', rpc_xid, rpc_message_type, rpc_rpc_version, rpc_program, rpc_program_version, rpc_procedure)
+    def send_call(self, program, program_version, procedure, data=None, message_type=0, version=2, auth=None):
+        """Send an RPC call without waiting for the reply; return its XID."""
+        logger.debug("RPC.send_call: Preparing request to %s:%s, procedure=%s", self.host, self.port, procedure)
+        rpc_xid = next(RPC._xid_counter) & 0xffffffff
 
         if auth is None:    # AUTH_NULL
-            proto += struct.pack('!LL', 0, 0)
+            cred = _AUTH_NULL
         elif auth["flavor"] == 1:   # AUTH_UNIX
-            stamp = int(time.time()) & 0xffff
-            auth_data = struct.pack("!LL", stamp, len(auth["machine_name"]))
-            auth_data += auth["machine_name"].encode()
-            auth_data += b'\x00'*((4-len(auth["machine_name"]) % 4) % 4)
-            auth_data += struct.pack("!LL", auth["uid"], auth["gid"])
-            if len(auth['aux_gid']) == 1 and auth['aux_gid'][0] == 0:
-                auth_data += struct.pack("!L", 0)
+            # Clients pass the same auth dict on every call; memoize its
+            # template on the instance so the steady state skips even the
+            # cache-key construction (encode, len, padding math).
+            if auth is self._last_auth:
+                cred = self._last_auth_template
             else:
-                auth_data += struct.pack("!L", len(auth["aux_gid"]))
-                for aux_gid in auth["aux_gid"]:
-                    auth_data += struct.pack("!L", aux_gid)
-            proto += struct.pack('!LL', 1, len(auth_data))
-            proto += auth_data
+                cred = self._auth_unix_template(auth)
+                self._last_auth = auth
+                self._last_auth_template = cred
+            # The 16-bit stamp has one-second resolution anyway, so reading
+            # the wall clock once per second instead of once per RPC loses
+            # nothing; time.monotonic is the cheaper clock to poll.
+            now = time.monotonic()
+            if now - self._stamp_refreshed >= 1:
+                self._stamp = int(time.time()) & 0xffff
+                self._stamp_refreshed = now
+            _U32.pack_into(cred, 8, self._stamp)
         else:
             raise Exception("RPC unknown auth method")
-        proto += struct.pack('!LL', rpc_verifier_flavor, rpc_verifier_length)
 
-        if data is not None:
-            proto += data
+        proto = _encode_call(self._send_buf, rpc_xid, message_type, version, program, program_version, procedure, cred, data)
+
+        if self._cork_buf is not None:
+            self._cork_buf.extend(proto)
+            return rpc_xid
+
+        try:
+            logger.debug("RPC.send_call: Sending request (%d bytes)", len(proto))
+            # Fragment header and body share one buffer and one sendall, so
+            # they leave in a single TCP segment even with Nagle disabled;
+            # no MSG_MORE/TCP_CORK dance is needed to coalesce them.
+            self.client.sendall(memoryview(proto))
+        except Exception as e:
+            raise RPCProtocolError(f"Error in RPC request: {e}") from e
+        return rpc_xid
+
+    def cork(self):
+        """Start batching outgoing calls; frames queue up until uncork().
 
-        rpc_fragment_header = 0x80000000 + len(proto)
-        proto = struct.pack('!L', rpc_fragment_header) + proto
+        A run of pipelined calls otherwise costs one sendall syscall (and,
+        with Nagle disabled, one TCP segment) each; corked, the whole
+        batch leaves in a single syscall.
+        """
+        if self._cork_buf is None:
+            self._cork_buf = bytearray()
 
+    def uncork(self):
+        """Flush every call queued since cork() in one sendall."""
+        batch, self._cork_buf = self._cork_buf, None
+        if not batch:
+            return
         try:
-            logger.debug(f"RPC.request: Sending request ({len(proto)} bytes)")
-            self.client.send(proto)
+            logger.debug("RPC.uncork: Sending batched requests (%d bytes)", len(batch))
+            self.client.sendall(memoryview(batch))
+        except Exception as e:
+            raise RPCProtocolError(f"Error in RPC request: {e}") from e
 
-            last_fragment = False
-            data = b""
+    def recv_reply(self, xid):
+        """Receive the reply for a given XID, buffering out-of-order replies."""
+        if xid in self.pending_replies:
+            return self.pending_replies.pop(xid)
 
-            while not last_fragment:
-                response = self.recv()
-                last_fragment = struct.unpack('!L', response[:4])[0] & 0x80000000 != 0
-                data += response[4:]
+        try:
+            while True:
+                last_fragment, data = self.recv()
+                while not last_fragment:
+                    last_fragment, fragment = self.recv()
+                    data.extend(fragment)
 
-            rpc = data[:24]
-            (
-                rpc_XID,
-                rpc_Message_Type,
-                rpc_Reply_State,
-                rpc_Verifier_Flavor,
-                rpc_Verifier_Length,
-                rpc_Accept_State
-            ) = struct.unpack('!LLLLLL', rpc)
+                (
+                    rpc_XID,
+                    rpc_Message_Type,
+                    rpc_Reply_State,
+                    rpc_Verifier_Flavor,
+                    rpc_Verifier_Length,
+                    rpc_Accept_State
+                ) = _HDR6.unpack_from(data, 0)
 
-            logger.debug(f"RPC.request: Received reply, Message_Type={rpc_Message_Type}, Accept_State={rpc_Accept_State}")
+                logger.debug("RPC.recv_reply: Received reply, XID=%s, Message_Type=%s, Accept_State=%s",
+                             rpc_XID, rpc_Message_Type, rpc_Accept_State)
 
-            if rpc_Message_Type != 1 or rpc_Reply_State != 0 or rpc_Accept_State != 0:
-                raise Exception("RPC protocol error")
+                if rpc_Message_Type != 1 or rpc_Reply_State != 0 or rpc_Accept_State != 0:
+                    raise Exception("RPC protocol error")
 
-            data = data[24:]
+                # Zero-copy view past the reply header; copying the whole
+                # payload here would be an O(N) memcpy per RPC.
+                data = memoryview(data)[24:]
+                if rpc_XID == xid:
+                    return data
+                self.pending_replies[rpc_XID] = data
         except Exception as e:
-            # logger.exception("Exception during RPC.request:")
+            # logger.exception("Exception during RPC.recv_reply:")
             # still raise the exception to be handled by the caller
-            raise RPCProtocolError(f"Error in RPC request: {e}")
-        return data
+            raise RPCProtocolError(f"Error in RPC request: {e}") from e
+
+    def request(self, program, program_version, procedure, data=None, message_type=0, version=2, auth=None):
+        xid = self.send_call(program, program_version, procedure, data=data,
+                             message_type=message_type, version=version, auth=auth)
+        return self.recv_reply(xid)
 
     def connect(self):
-        logger.debug(f"Connecting to {self.host}:{self.port} with timeout {self.timeout}")
+        logger.debug("Connecting to %s:%s with timeout %s", self.host, self.port, self.timeout)
         self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.client.settimeout(self.timeout)
-        random_port = None
+        # NFS RPCs are small request/reply exchanges; without TCP_NODELAY,
+        # Nagle plus delayed ACK can add ~40ms per call. Larger socket
+        # buffers keep multi-fragment READ/WRITE transfers off the ceiling.
+        self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        self.client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
         try:
-            i = 0
-            while True:
-                try:
-                    random_port = randint(10000, 11000) # changed this range to enable non-privileged ports
-                    i += 1
-                    self.client.bind(('', random_port))
-                    self.client_port = random_port
-                    logger.debug("Port %d occupied" % self.client_port)
-                    break
-                except Exception as e:
-                    logger.warning(f"Socket port binding with {random_port} failed in loop {i}, try again. {e}")
-                    continue
+            # Let the kernel pick an ephemeral port; the old randint(10000,
+            # 11000) retry loop collides under load and pays an exception
+            # unwind per failed bind.
+            self.client.bind(('', 0))
+            self.client_port = self.client.getsockname()[1]
+            logger.debug("Port %d occupied" % self.client_port)
         except Exception as e:
-            logger.error(f"[ERROR] Error in port binding: {e}")
+            logger.error("Error in port binding: %s", e)
 
         self.client.connect((self.host, self.port))
-        logger.debug(f"Connected to {self.host}:{self.port}")
-        RPC.connections.append(self)
+        logger.debug("Connected to %s:%s", self.host, self.port)
+        # A fresh socket means any half-read frame from a previous
+        # connection is garbage, as are calls corked for the old one.
+        del self._rx_buf[:]
+        self._cork_buf = None
+        self.pending_replies.clear()
+        RPC._connections.add(self)
+
+    def __enter__(self):
+        """Connect on entry so clients stack cleanly in with-blocks."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.disconnect()
+        except Exception as e:
+            logger.warning("Error disconnecting socket: %s", e)
+        return False
 
     def disconnect(self):
         logger.debug("Disconnecting socket.")
@@ -127,39 +261,37 @@ class RPC(object):
     @classmethod
     def disconnect_all(cls):
         counter = 0
-        for item in cls.connections:
+        for item in list(cls._connections):
             try:
                 item.client.close()
                 counter += 1
             except Exception as e:
-                logger.warning(f"Error disconnecting socket: {e}")
+                logger.warning("Error disconnecting socket: %s", e)
         logger.debug("Disconnect all connecting rpc sockets, amount: %d" % counter)
 
-    def recv(self):
-        rpc_response_size = b""
+    def _fill(self, need):
+        """Buffer incoming bytes until at least *need* are available."""
+        scratch = memoryview(self._rx_scratch)
+        while len(self._rx_buf) < need:
+            received = self.client.recv_into(self._rx_scratch)
+            if not received:
+                raise RPCProtocolError("Connection closed by server")
+            self._rx_buf.extend(scratch[:received])
 
+    def recv(self):
+        """Receive one record fragment; returns (last_fragment, payload)."""
         try:
-            while len(rpc_response_size) != 4:
-                chunk = self.client.recv(4 - len(rpc_response_size))
-                if not chunk:
-                    raise RPCProtocolError("Connection closed by server while reading header")
-                rpc_response_size += chunk
-
-            if len(rpc_response_size) != 4:
-                raise RPCProtocolError("incorrect recv response size: %d" % len(rpc_response_size))
-            response_size = struct.unpack('!L', rpc_response_size)[0] & 0x7fffffff
-
-            rpc_response = rpc_response_size
-            while len(rpc_response) < response_size:
-                chunk_size = response_size - len(rpc_response) + 4
-                
-                chunk = self.client.recv(chunk_size)
-                if not chunk:
-                    raise RPCProtocolError("Connection closed by server")
-                rpc_response = rpc_response + chunk
-
-            return rpc_response
+            self._fill(4)
+            size_field = _U32.unpack_from(self._rx_buf)[0]
+            last_fragment = size_field & 0x80000000 != 0
+            size = size_field & 0x7fffffff
+
+            self._fill(4 + size)
+            buf = bytearray(memoryview(self._rx_buf)[4:4 + size])
+            del self._rx_buf[:4 + size]
+
+            return last_fragment, buf
         except Exception as e:
             # logger.exception(e)
             # but still raise the exception to be handled by the caller
-            raise RPCProtocolError(f"Error receiving data: {e}")
+            raise RPCProtocolError(f"Error receiving data: {e}") from e
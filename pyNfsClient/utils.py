@@ -12,8 +12,10 @@ else:
     LONG = long
 
 
-# convert string to bytes
+# convert string to bytes; pre-encoded payloads pass through untouched
 def str_to_bytes(str_v):
+    if isinstance(str_v, bytes):
+        return str_v
     if PY3:
         return str(str_v).encode()
     else:
@@ -1,165 +1,339 @@
 import os
+import json
+import queue
+import sys
+import random
+import socket
+import hashlib
+import tempfile
+import logging
+import logging.handlers
 import time
-from pyNfsClient import (Mount, NFSv3, MNT3_OK, NFS_PROGRAM, NFS_V3, NFS3_OK, DATA_SYNC, NFS3ERR_EXIST, NFS3ERR_NOENT)
-import concurrent.futures
-import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pyNfsClient import (Mount, NFSv3, MNT3_OK, NFS_PROGRAM, NFS_V3, NFS3_OK, UNSTABLE, NFS3ERR_EXIST, NFS3ERR_JUKEBOX, NFS3ERR_NOENT, NFS3ERR_STALE)
+from pyNfsClient.rpc import RPCProtocolError
 import argparse
+import atexit
 
 TIMEOUT = 1 # Default timeout for NFS operations 
 RETRIES = 20 # Number of retries for NFS operations
 FILE_REPS = 3 # Number of repetitions for file content
 FILE_COUNT = 2 # Number of files to create
 DIR_NAME = "dir2" # Directory name to create and use
-RETRY_DELAY = 1 # Delay between retries in seconds
+BASE_DELAY = 0.05 # Initial backoff delay in seconds
+MAX_DELAY = 5.0 # Backoff delay cap in seconds
+BATCH_BYTES = 1 << 20 # Unstable-write bytes to accumulate before committing
+POOL_SIZE = 4 # Parallel NFS connections (nconnect-style)
 MODE="exec+verify"
 
 RETRY_FAILED = "RETRY_FAILED"
 SETUP_FAILED = "SETUP_FAILED"
 
-def timeout(seconds):
-    """Decorator to run a function with a timeout using ThreadPoolExecutor."""
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(func, *args, **kwargs)
-                try:
-                    return future.result(timeout=seconds)
-                except concurrent.futures.TimeoutError:
-                    print(f"Function '{func.__name__}' timed out after {seconds} seconds")
-                    return None
-        return wrapper
-    return decorator
-
+# Hot-path diagnostics go through logging rather than print: print takes
+# the stdout lock and flushes (one write syscall) per line, which is real
+# CPU on a write-heavy run. Per-RPC chatter sits at DEBUG, lifecycle
+# events at INFO, and only the final verification summary stays on
+# stdout; the default level keeps the hot path silent. Records are handed
+# to a queue and formatted/written by a background listener thread, so
+# even with verbose levels enabled the RPC loop never blocks on stderr.
+log = logging.getLogger("nfsclient")
+_handler = logging.StreamHandler()
+_handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+_log_queue = queue.SimpleQueue()
+_listener = logging.handlers.QueueListener(_log_queue, _handler)
+_listener.start()
+atexit.register(_listener.stop)
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+log.setLevel(logging.WARNING)
+
+# One worker pool for the whole process; spinning up a fresh
+# ThreadPoolExecutor per call pays a thread spawn and join each time.
+_WORKER_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="nfs-worker")
+atexit.register(_WORKER_POOL.shutdown, wait=False)
+
+# Per-RPC timeouts are enforced by the socket itself: RPC.connect calls
+# settimeout(TIMEOUT), so a stalled call raises socket.timeout out of the
+# recv/send syscall and is handled by nfs_retry. The old
+# ThreadPoolExecutor-based timeout decorator paid a thread spawn and
+# teardown per wrapped call and could not actually interrupt the I/O. No
+# SIGALRM/setitimer fallback is needed: every blocking call here ends in
+# a socket operation, and signals would not reach pool worker threads.
 
 from functools import wraps
 
-def nfs_retry(retries=3):
-    """Decorator to retry NFS operations, reconnecting on failure or exception."""
+def backoff_delay(attempt):
+    """Capped exponential backoff with full jitter: retries spread out
+    instead of hammering the server in lockstep, and early retries stay
+    fast instead of always waiting the full fixed delay."""
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * (2 ** attempt)))
+
+def nfs_retry(retries=None):
+    """Decorator to retry NFS operations. Only transport failures (socket
+    errors, RPC protocol errors) tear down and re-establish the
+    connections; application-level NFS errors retry on the same connection
+    since a reconnect costs a TCP handshake plus mount traffic and would
+    not change the server's answer.
+
+    With no argument the retry count is read from self.retries at call
+    time, so the command line takes effect; a decoration-time argument
+    would freeze the import-time default into the class."""
     def decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
 
-            starting_time = time.time() 
-            
-            for attempt in range(retries):
+            attempts = retries if retries is not None else self.retries
+
+            # Only pay for timing when someone will see it; at the default
+            # WARNING level the success path is a plain call and return.
+            timing = log.isEnabledFor(logging.INFO)
+            starting_time = time.perf_counter() if timing else 0.0
+
+            for attempt in range(attempts):
+                reconnect = False
                 try:
                     ret = func(self, *args, **kwargs)
-                    finish_time = time.time()
-                    print(f"[INFO] {func.__name__} completed in {finish_time - starting_time:.2f} seconds")
+                    if timing:
+                        log.info("%s completed in %.2f seconds",
+                                 func.__name__, time.perf_counter() - starting_time)
                     return ret
+                except (RPCProtocolError, socket.error) as e:
+                    cause = e.__cause__ or e
+                    if isinstance(cause, (socket.timeout, TimeoutError)):
+                        # The socket is still alive, just slow; retrying on
+                        # the existing session avoids a multi-RTT reconnect.
+                        log.error("Timeout in %s (attempt %d): %s", func.__name__, attempt + 1, e)
+                    else:
+                        log.error("Transport error in %s (attempt %d): %s", func.__name__, attempt + 1, e)
+                        reconnect = True
                 except Exception as e:
-                    print(f"[ERROR] Exception in {func.__name__} (attempt {attempt+1}): {e}")
-                    
-                    
-                # Reconnect and retry
-                self.cleanup()
-                
-                time.sleep(RETRY_DELAY)
+                    log.error("Exception in %s (attempt %d): %s", func.__name__, attempt + 1, e)
 
-                try:
-                    self.setup()
-                except Exception as e:
-                    print(f"[ERROR] Setup failed during retry (attempt {attempt+1}): {e}")
-                    return SETUP_FAILED
+                time.sleep(backoff_delay(attempt))
+
+                if reconnect:
+                    self.cleanup()
+                    try:
+                        self.setup()
+                    except Exception as e:
+                        log.error("Setup failed during retry (attempt %d): %s", attempt + 1, e)
+                        return SETUP_FAILED
 
-            print(f"Failed to execute {func.__name__} after {retries} retries.")
+            log.error("Failed to execute %s after %d retries.", func.__name__, attempts)
             return RETRY_FAILED
         return wrapper
     return decorator
 
 
+class NfsSessionPool:
+    """LIFO pool of connected NFSv3 sessions keyed to one (host, port).
+
+    Retries and parallel verify workers reuse warm TCP connections
+    instead of paying a fresh handshake each time, and concurrent
+    workers each get their own socket (nconnect-style multiplexing).
+    Only hard transport errors invalidate a session; timeouts retry on
+    the same socket, and file handles (including root_fh from the one
+    MNT call) stay valid across reconnects, so a transient failure never
+    costs a re-mount."""
+
+    def __init__(self, host, port, timeout, auth, max_size=4):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.auth = auth
+        self._sessions = queue.LifoQueue(max_size)
+
+    def acquire(self):
+        try:
+            return self._sessions.get_nowait()
+        except queue.Empty:
+            session = NFSv3(self.host, self.port, self.timeout, auth=self.auth)
+            session.connect()
+            return session
+
+    def release(self, session):
+        try:
+            self._sessions.put_nowait(session)
+        except queue.Full:
+            self.invalidate(session)
+
+    def invalidate(self, session):
+        """Close a session whose socket is suspect instead of pooling it.
+
+        shutdown() before close makes any thread still blocked in recv on
+        this socket return immediately instead of waiting out its timeout."""
+        try:
+            session.client.shutdown(socket.SHUT_RDWR)
+        except Exception:
+            pass
+        try:
+            session.disconnect()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                self.invalidate(self._sessions.get_nowait())
+            except queue.Empty:
+                break
+
+
 class NFSClient:
     def __init__(self, host, mnt_port, nfs_port, mount_path,
-                 user_id=None, group_id=None, file_count=10, loop_delay=0.1,
-                 rep_count=10):
+                 user_id=None, group_id=None, file_count=10,
+                 rep_count=10, pipeline_depth=8, pool_size=POOL_SIZE,
+                 timeout=TIMEOUT, retries=RETRIES):
         self.host = host
         self.mnt_port = mnt_port
         self.nfs_port = nfs_port
         self.mount_path = mount_path
         self.file_count = file_count
-        self.loop_delay = loop_delay
         self.rep_count = rep_count
+        self.pipeline_depth = pipeline_depth
+        self.pool_size = pool_size
+        # Config is frozen onto the instance at construction; decorators
+        # and connect loops read these at call time instead of module
+        # globals that argparse mutates after import.
+        self.timeout = timeout
+        self.retries = retries
 
         self.user_id = user_id if user_id is not None else os.getuid()
         self.group_id = group_id if group_id is not None else os.getgid()
+        # One frozen auth dict for the whole client; pyNfsClient caches the
+        # marshaled AUTH_UNIX blob per credential, so passing this same
+        # object everywhere means the XDR encode happens exactly once.
         self.auth = {
             "flavor": 1,
             "machine_name": host,
             "uid": self.user_id,
             "gid": self.group_id,
-            "aux_gid": list(),
+            "aux_gid": (),
         }
         self.mount = None
         self.nfs3 = None
+        self.nfs_pool = None
         self.root_fh = None
         self.dir_fh = None
+        # Positive lookup cache, (parent_fh, name) -> fh; NFS positive
+        # lookups are stable for this workload, so repeat walks skip a
+        # full LOOKUP round trip per name.
+        self._fh_cache = {}
+        # Payload bytes per file number, built on first use; exec and
+        # verify need the exact same content, so build it once, not twice.
+        self._payloads = {}
 
 
     def connect_nfs(self):
-        for attempt in range(RETRIES):
+        if self.nfs_pool is None:
+            self.nfs_pool = NfsSessionPool(self.host, self.nfs_port,
+                                           self.timeout, self.auth, max_size=self.pool_size)
+        for attempt in range(self.retries):
             try:
-                self.nfs3 = NFSv3(self.host, self.nfs_port, 
-                                  TIMEOUT, auth=self.auth)
-                self.nfs3.connect()
-                print(f"Connected to NFS server at {self.host}:{self.nfs_port}")
+                self.nfs3 = self.nfs_pool.acquire()
+                log.info("Connected to NFS server at %s:%s", self.host, self.nfs_port)
                 return
             except Exception as e:
-                print(f"[ERROR] NFS connection attempt {attempt+1} failed: {e}")
-                if attempt < RETRIES - 1:
-                    print(f"Retrying in {TIMEOUT} seconds...")
-                    time.sleep(TIMEOUT)
+                log.error("NFS connection attempt %d failed: %s", attempt + 1, e)
+                if attempt < self.retries - 1:
+                    time.sleep(backoff_delay(attempt))
         raise Exception("Failed to connect to NFS server after multiple attempts")
     
     def connect_mount(self):
-        for attempt in range(RETRIES):
+        if self.mount is None:
+            self.mount = Mount(host=self.host, auth=self.auth,
+                               port=self.mnt_port, timeout=self.timeout)
+        for attempt in range(self.retries):
             try:
-                self.mount = Mount(host=self.host, auth=self.auth, 
-                                   port=self.mnt_port, timeout=TIMEOUT)
                 self.mount.connect()
-                print(f"Connected to mount at {self.host}:{self.mnt_port}")
+                log.info("Connected to mount at %s:%s", self.host, self.mnt_port)
                 return
             except Exception as e:
-                print(f"[ERROR] Mount Connected attempt {attempt+1} failed: {e}")
-                if attempt < RETRIES - 1:
-                    print(f"Retrying in {TIMEOUT} seconds...")
-                    time.sleep(TIMEOUT)
+                log.error("Mount Connected attempt %d failed: %s", attempt + 1, e)
+                if attempt < self.retries - 1:
+                    time.sleep(backoff_delay(attempt))
         raise Exception("Failed to mount NFS after multiple attempts")
 
     
     def setup(self):
-        print(f"Using user ID: {self.user_id}, group ID: {self.group_id}")
+        log.info("Using user ID: %s, group ID: %s", self.user_id, self.group_id)
         try:
-            self.connect_mount()
-            self.connect_nfs() 
+            # The mount and NFS connects target independent sockets (and
+            # usually independent ports); overlapping their handshakes
+            # saves an RTT on every setup, which nfs_retry pays again on
+            # each reconnect. Each keeps its own retry loop.
+            mount_future = _WORKER_POOL.submit(self.connect_mount)
+            nfs_future = _WORKER_POOL.submit(self.connect_nfs)
+            mount_future.result()
+            nfs_future.result()
         except Exception as e:
-            print(f"Setup failed: {e}")
+            log.error("Setup failed: %s", e)
         
     def cleanup(self):
-        try: 
+        try:
             if self.nfs3:
-                self.nfs3.disconnect()
+                # cleanup mostly runs on error paths, where the session's
+                # socket is suspect; drop it rather than repooling it
+                if self.nfs_pool:
+                    self.nfs_pool.invalidate(self.nfs3)
+                else:
+                    self.nfs3.disconnect()
                 self.nfs3 = None
         except Exception as e:
-            print(f"Error during NFS cleanup: {e}")
+            log.error("Error during NFS cleanup: %s", e)
             self.nfs3 = None
-            
+
         try:
             if self.mount:
                 self.mount.disconnect()
                 self.mount = None
         except Exception as e:
-            print(f"Error during mount cleanup: {e}")
+            log.error("Error during mount cleanup: %s", e)
             self.mount = None
 
                 
-    @nfs_retry(RETRIES)
-    def mount_fs(self): 
+    def _root_fh_cache_path(self):
+        key = hashlib.md5(f"{self.host}:{self.mount_path}".encode()).hexdigest()
+        return os.path.join(tempfile.gettempdir(), f"nfs_root_fh_{key}.json")
+
+    def _load_cached_root_fh(self):
+        """Return the root fh from a previous run, or None."""
+        try:
+            with open(self._root_fh_cache_path()) as f:
+                return bytes.fromhex(json.load(f)["fhandle"])
+        except Exception:
+            return None
+
+    def _store_cached_root_fh(self, fh):
+        try:
+            with open(self._root_fh_cache_path(), "w") as f:
+                json.dump({"fhandle": fh.hex()}, f)
+        except Exception as e:
+            log.warning("Could not persist root fh cache: %s", e)
+
+    @nfs_retry()
+    def mount_fs(self):
+        # The export's root fh only changes on server reboot or export
+        # reconfiguration, so a handle cached from a previous run plus one
+        # cheap GETATTR to validate it replaces the MNT round trip.
+        cached = self._load_cached_root_fh()
+        if cached is not None:
+            try:
+                getattr_res = self.nfs3.getattr(cached, auth=self.auth)
+            except Exception as e:
+                getattr_res = None
+                log.debug("Cached root fh validation failed: %s", e)
+            if getattr_res and getattr_res["status"] == NFS3_OK:
+                self.root_fh = cached
+                log.info("Reusing cached root file handle for %s", self.mount_path)
+                return
+
         mnt_res = self.mount.mnt(self.mount_path, self.auth)
         if mnt_res["status"] != MNT3_OK:
             raise Exception(f"Mount failed: {mnt_res['status']}")
         self.root_fh = mnt_res["mountinfo"]["fhandle"]
-        print(f"Mounted NFS at {self.mount_path} with root file handle: {self.root_fh}")
+        self._store_cached_root_fh(self.root_fh)
+        log.info("Mounted NFS at %s with root file handle: %s", self.mount_path, self.root_fh)
     
     
     # intentionally left out the decorator. see comment below 
@@ -171,150 +345,313 @@ class NFSClient:
             try:
                 self.mount.umnt()
             except Exception as e:
-                print("Unmount Failed. Skipping retries for now.")
+                log.warning("Unmount Failed. Skipping retries for now.")
     
-    @nfs_retry(RETRIES)
+    @nfs_retry()
     def nfs_mkdir(self, dir_name, mode=0o777, exists_okay=False):
         mkdir_res = self.nfs3.mkdir(self.root_fh, dir_name, mode=mode, auth=self.auth)
+        self.invalidate_fh_cache(self.root_fh, dir_name)
         if mkdir_res["status"] == NFS3ERR_EXIST and exists_okay:
             return mkdir_res
         if mkdir_res["status"] != NFS3_OK:
             raise Exception(f"mkdir failed for {dir_name}: {mkdir_res['status']}")
+        # MKDIR's reply carries the new directory's post-op handle (when
+        # the server chose to include it); caching it makes the lookup
+        # that follows a cache hit instead of another round trip.
+        obj = mkdir_res["resok"]["obj"]
+        if obj.get("present"):
+            self._cache_fh(self.root_fh, dir_name, obj["handle"]["data"])
         return mkdir_res
 
 
-    @nfs_retry(RETRIES)
+    @nfs_retry()
     def nfs_lookup_fh(self, parent, dir_name):
+        cached = self._fh_cache.get((parent, dir_name))
+        if cached is not None:
+            return cached
         dir_lookup = self.nfs3.lookup(parent, dir_name, self.auth)
-        print(f"Lookup result for {dir_name} with results {dir_lookup["status"]}")
+        log.debug("Lookup result for %s with results %s", dir_name, dir_lookup['status'])
         if dir_lookup["status"] == NFS3ERR_NOENT: 
             return NFS3ERR_NOENT
         if dir_lookup["status"] != NFS3_OK:
             raise Exception(f"lookup failed for {dir_name} in {parent}: {dir_lookup['status']}")
-        return dir_lookup["resok"]["object"]["data"]
-
-    @nfs_retry(RETRIES)
-    def create_file(self, number):
-        filename = f"file{number}.txt"
-        create_res = self.nfs3.create(self.dir_fh, filename, 0, auth=self.auth)
-        if create_res["status"] != NFS3_OK:
-            raise Exception(f"Create failed for {filename}: {create_res['status']}")
-        file_fh = create_res["resok"]["obj"]["handle"]["data"]
-        # Print file handle in hex for better readability
-        print(f"Created {filename}, file handle: {file_fh.hex() if isinstance(file_fh, bytes) else str(file_fh)}")
-        return filename, file_fh
-
-    @nfs_retry(RETRIES)
-    def write_to_file(self, file_fh, number):
-        if file_fh is None:
-            return  # Don't attempt to write to a nonexistent file
-
-        file_content = ""
-        for rep in range(1, self.rep_count + 1):
-            file_content += f"this is file number {number}, This the repetition number {rep}\n"
-
-        write_res = self.nfs3.write(
-            file_fh, offset=0, count=len(file_content),
-            content=file_content, stable_how=DATA_SYNC, auth=self.auth)
-
-        if write_res["status"] != NFS3_OK:
-            print(f"Write failed for file{number}.txt: {write_res['status']}")
-            raise Exception(f"Write failed for file{number}.txt: {write_res['status']}")
-
-        return 0 
-
-    
+        fh = dir_lookup["resok"]["object"]["data"]
+        self._cache_fh(parent, dir_name, fh)
+        return fh
+
+    def _cache_fh(self, parent, name, fh):
+        """Remember a file handle for (parent, name), from LOOKUP or from
+        a mutation's post-op handle; bounded so pathological runs cannot
+        grow the cache forever."""
+        if len(self._fh_cache) >= 4096:
+            self._fh_cache.clear()
+        self._fh_cache[(parent, name)] = fh
+
+    def invalidate_fh_cache(self, parent, name=None):
+        """Drop cached lookups after a mutation under *parent*."""
+        if name is not None:
+            self._fh_cache.pop((parent, name), None)
+        else:
+            for key in [k for k in self._fh_cache if k[0] == parent]:
+                del self._fh_cache[key]
+
+    def _make_payload(self, number):
+        """Return the full content of one file as a single bytes payload,
+        memoized so exec and verify share one build per file."""
+        payload = self._payloads.get(number)
+        if payload is None:
+            # A list comprehension lets join size the result in one pass,
+            # unlike a generator feeding it values one at a time.
+            payload = "".join([f"this is file number {number}, This the repetition number {rep}\n"
+                               for rep in range(1, self.rep_count + 1)]).encode("ascii")
+            self._payloads[number] = payload
+        return payload
+
+    @staticmethod
+    def _commit_batch(session, dirty, auth):
+        """COMMIT every file written UNSTABLE since the last flush.
+
+        One DATA_SYNC write per file costs an fsync-equivalent stall per
+        RPC; writing UNSTABLE and committing a batch of files at once
+        replaces N sync stalls with one flush per BATCH_BYTES of data.
+        The COMMITs themselves are pipelined: all calls go out back to
+        back, then the replies are drained, so the batch costs ~one RTT
+        instead of one per file.
+
+        Each COMMIT's verf cookie is checked against the one the WRITE
+        reply carried; a mismatch means the server rebooted between the
+        unstable write and the commit and may have lost the data, so the
+        batch fails and nfs_retry re-runs the writes."""
+        session.cork()
+        xids = [(number, write_verf, session.commit_call(file_fh, auth=auth))
+                for number, file_fh, write_verf in dirty]
+        session.uncork()
+        for number, write_verf, xid in xids:
+            commit_res = session.commit_reply(xid)
+            if commit_res["status"] != NFS3_OK:
+                raise Exception(f"Commit failed for file{number}.txt: {commit_res['status']}")
+            if commit_res["resok"]["verf"] != write_verf:
+                raise Exception(f"Commit verf mismatch for file{number}.txt: "
+                                "server restarted, unstable data may be lost")
+        dirty.clear()
+
+    def _create_and_write_range(self, numbers):
+        """Create and write the given file numbers on one pooled session
+        starting from pipeline_depth RPCs in flight: CREATEs are topped up
+        to the window, each CREATE reply immediately fires that file's
+        WRITE, and writes are drained when the window is full. Writes go
+        out UNSTABLE and are made durable by batched COMMITs.
+
+        The window adapts AIMD-style to what the server can take: it
+        grows by one every 16 successful replies, and an NFS3ERR_JUKEBOX
+        reply halves it and re-issues that RPC instead of failing the
+        whole range, so throughput follows server capacity without a
+        tuned constant."""
+        session = self.nfs_pool.acquire()
+        try:
+            in_flight_creates = deque()
+            in_flight_writes = deque()
+            dirty = []
+            dirty_bytes = 0
+            sent = 0
+            window = self.pipeline_depth
+            window_cap = self.pipeline_depth * 4
+            successes = 0
+
+            while sent < len(numbers) or in_flight_creates or in_flight_writes:
+                while (sent < len(numbers) and
+                       len(in_flight_creates) + len(in_flight_writes) < window):
+                    number = numbers[sent]
+                    sent += 1
+                    # One filename build per file, shared by the call, the
+                    # fh cache and any error message.
+                    filename = f"file{number}.txt"
+                    xid = session.create_call(self.dir_fh, filename, 0, auth=self.auth)
+                    in_flight_creates.append((number, filename, xid))
+
+                if in_flight_creates:
+                    number, filename, xid = in_flight_creates.popleft()
+                    create_res = session.create_reply(xid)
+                    if create_res["status"] == NFS3ERR_JUKEBOX:
+                        window = max(1, window // 2)
+                        time.sleep(backoff_delay(0))
+                        xid = session.create_call(self.dir_fh, filename, 0, auth=self.auth)
+                        in_flight_creates.append((number, filename, xid))
+                        continue
+                    if create_res["status"] != NFS3_OK:
+                        raise Exception(f"Create failed for {filename}: {create_res['status']}")
+                    successes += 1
+                    if successes % 16 == 0:
+                        window = min(window + 1, window_cap)
+                    file_fh = create_res["resok"]["obj"]["handle"]["data"]
+                    log.debug("Created %s, file handle: %s", filename,
+                              file_fh.hex() if isinstance(file_fh, bytes) else str(file_fh))
+                    # The CREATE reply carries the post-op handle; caching
+                    # it here means verify never pays a LOOKUP per file.
+                    self._cache_fh(self.dir_fh, filename, file_fh)
+
+                    payload = self._make_payload(number)
+                    write_xid = session.write_call(
+                        file_fh, offset=0, count=len(payload),
+                        content=payload, stable_how=UNSTABLE, auth=self.auth)
+                    in_flight_writes.append((number, filename, write_xid, file_fh, len(payload)))
+
+                while in_flight_writes and (
+                        len(in_flight_creates) + len(in_flight_writes) >= window
+                        or (sent >= len(numbers) and not in_flight_creates)):
+                    number, filename, write_xid, file_fh, written = in_flight_writes.popleft()
+                    write_res = session.write_reply(write_xid)
+                    if write_res["status"] == NFS3ERR_JUKEBOX:
+                        window = max(1, window // 2)
+                        time.sleep(backoff_delay(0))
+                        payload = self._make_payload(number)
+                        write_xid = session.write_call(
+                            file_fh, offset=0, count=len(payload),
+                            content=payload, stable_how=UNSTABLE, auth=self.auth)
+                        in_flight_writes.append((number, filename, write_xid, file_fh, written))
+                        continue
+                    if write_res["status"] != NFS3_OK:
+                        raise Exception(f"Write failed for {filename}: {write_res['status']}")
+                    successes += 1
+                    if successes % 16 == 0:
+                        window = min(window + 1, window_cap)
+                    log.debug("Wrote %s", filename)
+                    dirty.append((number, file_fh, write_res["resok"]["verf"]))
+                    dirty_bytes += written
+                    if dirty_bytes >= BATCH_BYTES:
+                        self._commit_batch(session, dirty, self.auth)
+                        dirty_bytes = 0
+
+            if dirty:
+                self._commit_batch(session, dirty, self.auth)
+        except Exception:
+            self.nfs_pool.invalidate(session)
+            raise
+        self.nfs_pool.release(session)
+
+    @nfs_retry()
+    def create_and_write_files(self):
+        """Fan the file range out over a few worker threads, each running
+        the windowed create+write pipeline on its own pooled session, so
+        independent files progress in parallel across connections as well
+        as within one (nfsiod-style async I/O)."""
+        workers = max(1, min(self.pool_size, self.file_count))
+        slices = [list(range(w + 1, self.file_count + 1, workers)) for w in range(workers)]
+
+        if workers == 1:
+            self._create_and_write_range(slices[0])
+        else:
+            futures = [_WORKER_POOL.submit(self._create_and_write_range, chunk)
+                       for chunk in slices if chunk]
+            for future in futures:
+                future.result()
+        return 0
 
     def run(self, dir_name):
         try:
-            print(f"Creating directory: {dir_name}")
+            log.info("Creating directory: %s", dir_name)
             self.nfs_mkdir(dir_name, exists_okay=True)
-            
-            print(f"Directory {dir_name} created or already exists")
+
+            log.info("Directory %s created or already exists", dir_name)
             self.dir_fh = self.nfs_lookup_fh(self.root_fh, dir_name)
-            
-            time.sleep(1)
-            
-            
-            for number in range(1, self.file_count + 1):
-                print(f"Creating file {number} in directory {dir_name}")
-                filename, file_fh = self.create_file(number)
-            
-                if file_fh:
-                    if file_fh == RETRY_FAILED:
-                        print(f"Retry failed for file {number}")
-                        return 1
-                    
-                    print(f"Writing to file {number}")
-                    
-                    res = self.write_to_file(file_fh, number)
-                    if res == RETRY_FAILED: 
-                        print(f"Retry failed for file {number}")
-                        return 1
-                    if res == SETUP_FAILED:
-                        print(f"Setup failed for file {number}")
-                        return 2
-
-                    time.sleep(self.loop_delay)
-                else:
-                    print(f"Skipping write for file {number} due to creation failure")
-                    
-            return 0 
+
+            # No fixed pacing sleep: the server signals overload through
+            # NFS3ERR_JUKEBOX or a slow reply, and both feed the jittered
+            # backoff in nfs_retry, so throughput tracks server capacity
+            # instead of a hardcoded delay.
+            res = self.create_and_write_files()
+            if res == RETRY_FAILED:
+                log.error("Retry failed while creating/writing files")
+                return 1
+            if res == SETUP_FAILED:
+                log.error("Setup failed while creating/writing files")
+                return 2
+
+            return 0
         finally:
-            print("running done.")
+            log.info("running done.")
             # self.cleanup()
 
+    def _verify_one(self, dir_name, number):
+        """Verify a single file; returns (verified, buffered messages).
+
+        Files are independent, so workers overlap their RPC round trips;
+        each worker borrows its own session from the pool and output is
+        buffered so worker prints do not interleave."""
+        messages = []
+        filename = f"file{number}.txt"
+        messages.append(f"Verifying file {filename} in directory {dir_name}")
+
+        session = self.nfs_pool.acquire()
+        # Handles cached from the CREATE replies (or an earlier lookup)
+        # make the LOOKUP round trip here the exception, not the rule.
+        file_fh = self._fh_cache.get((self.dir_fh, filename))
+        if file_fh is None:
+            try:
+                lookup_res = session.lookup(self.dir_fh, filename, self.auth)
+            except Exception as e:
+                self.nfs_pool.invalidate(session)
+                messages.append(f"Lookup failed for {filename}: {e}")
+                return 0, messages
+            if lookup_res["status"] == NFS3_OK:
+                file_fh = lookup_res["resok"]["object"]["data"]
+                self._cache_fh(self.dir_fh, filename, file_fh)
+
+        if file_fh:
+            messages.append(f"File {filename} found, verifying content")
+            try:
+                read_res = session.read(file_fh, offset=0, auth=self.auth)
+            except Exception as e:
+                self.nfs_pool.invalidate(session)
+                messages.append(f"Read failed for {filename}: {e}")
+                return 0, messages
+            self.nfs_pool.release(session)
+            if read_res["status"] == NFS3_OK:
+                content = read_res["resok"]["data"]
+                expected_content = self._make_payload(number)
+                if content == expected_content:
+                    messages.append(f"File {filename} verified successfully")
+                    return 1, messages
+                messages.append(f"Content mismatch in file {filename}")
+            else:
+                if read_res["status"] == NFS3ERR_STALE:
+                    # Cached handle outlived the file; drop it so the next
+                    # attempt falls back to a fresh LOOKUP.
+                    self.invalidate_fh_cache(self.dir_fh, filename)
+                messages.append(f"Read failed for file {filename}: {read_res['status']}")
+        else:
+            self.nfs_pool.release(session)
+            messages.append(f"File {filename} not found in directory {dir_name}")
+        return 0, messages
+
     def verify_files(self, dir_name):
         """Verify that files were created and written to correctly."""
 
         self.dir_fh = self.nfs_lookup_fh(self.root_fh, dir_name)
-        # check if the directory exists 
-        
-        verified = [0] * self.file_count
-        
-        
-        for number in range(1, self.file_count + 1):
-            filename = f"file{number}.txt"
-            print(f"Verifying file {filename} in directory {dir_name}")
-            file_fh = self.nfs_lookup_fh(self.dir_fh, filename)
-
-            if file_fh:
-                print(f"File {filename} found, verifying content")
-                read_res = self.nfs3.read(file_fh, offset=0, auth=self.auth)
-                if read_res["status"] == NFS3_OK:
-                    content = read_res["resok"]["data"]
-                    expected_content = ""
-                    for rep in range(1, self.rep_count + 1):
-                        expected_content += f"this is file number {number}, This the repetition number {rep}\n"
-                    if content.decode() == expected_content:
-                        print(f"File {filename} verified successfully")
-                        verified[number - 1] = 1
-                    else:
-                        print(f"Content mismatch in file {filename}")
-                        verified[number - 1] = 0
-                else:
-                    print(f"Read failed for file {filename}: {read_res['status']}")
-            else:
-                print(f"File {filename} not found in directory {dir_name}")
-        
-        # print in yellow color
-        print("\033[93m" + f"Verification results for directory {dir_name}:")
-        
-        all_passed = all(status == 1 for status in verified)
-        
-        for status in verified:
-            if status == 1:
-                print("\033[92m" + "O", end="")
-            else:
-                print("\033[91m" + "X", end="")
-
-        # print("\nVerification complete.")
-        print("\033[93m" + "\nVerification complete.")
-        # Reset color
-        print("\033[0m")
-        
+        # check if the directory exists
+
+        # One byte per file instead of a list of int objects; the pass
+        # count below is then a single C-level count() scan.
+        verified = bytearray(self.file_count)
+
+        results = _WORKER_POOL.map(lambda number: self._verify_one(dir_name, number),
+                                   range(1, self.file_count + 1))
+        for number, (status, messages) in enumerate(results, start=1):
+            log.debug("%s", "\n".join(messages))
+            verified[number - 1] = status
+
+        all_passed = verified.count(1) == self.file_count
+
+        # One buffered write for the whole summary instead of a flushing
+        # print (and a write syscall) per file.
+        marks = "".join("\033[92mO" if status else "\033[91mX" for status in verified)
+        summary = (f"\033[93mVerification results for directory {dir_name}:\n"
+                   + marks
+                   + "\n\033[93mVerification complete.\n\033[0m\n")
         if all_passed:
-            print("CLIENT: All files verified successfully.")
+            summary += "CLIENT: All files verified successfully.\n"
+        sys.stdout.write(summary)
+        sys.stdout.flush()
         
 if __name__ == "__main__":
     home_dir = os.path.expanduser("~")
@@ -334,45 +671,46 @@ if __name__ == "__main__":
                         help=f"Number of files to create. Default: {FILE_COUNT}")
     parser.add_argument("--dir-name", default=DIR_NAME,
                         help=f"Target directory name. Default: {DIR_NAME}")
-    parser.add_argument("--retry-delay", type=int, default=RETRY_DELAY,
-                        help=f"Delay between retries (s). Default: {RETRY_DELAY}")
     parser.add_argument("--mode", default=MODE,
                         help=f"Operation mode: exec, verify, exec+verify. Default: {MODE}")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Logging level (DEBUG, INFO, WARNING, ...). Default: WARNING")
 
     # (Optional but handy) operational flags you might want anyway
     parser.add_argument("--host", default="localhost", help="NFS server host")
     parser.add_argument("--mnt-port", type=int, default=2049, help="mountd port")
     parser.add_argument("--nfs-port", type=int, default=2049, help="nfsd port")
     parser.add_argument("--mount-path", default=default_mount_path, help="Export path to mount")
-    parser.add_argument("--loop-delay", type=float, default=0.0, help="Sleep between file writes (s)")
+    parser.add_argument("--pipeline-depth", type=int, default=8,
+                        help="Max in-flight create/write RPCs. Default: 8")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE,
+                        help=f"Parallel NFS connections (nconnect-style). Default: {POOL_SIZE}")
     parser.add_argument("--uid", type=int, default=None, help="Override UID for auth")
     parser.add_argument("--gid", type=int, default=None, help="Override GID for auth")
 
     args = parser.parse_args()
 
-    # Update module-level constants (keeps simple places reading globals happy)
-    TIMEOUT = args.timeout
-    RETRIES = args.retries
-    FILE_REPS = args.file_reps
-    FILE_COUNT = args.file_count
+    # Config goes straight into the client instance; rebinding the module
+    # constants after import never reached code that had already captured
+    # them (decorator arguments bind at class-definition time).
     DIR_NAME = args.dir_name
-    RETRY_DELAY = args.retry_delay
     MODE = args.mode.lower()
-    
+    log.setLevel(getattr(logging, args.log_level.upper(), logging.WARNING))
+
     client = NFSClient(
         host=args.host,
         mnt_port=args.mnt_port,
         nfs_port=args.nfs_port,
         mount_path=args.mount_path,
-        file_count=FILE_COUNT,
-        loop_delay=args.loop_delay,
-        rep_count=FILE_REPS,
+        file_count=args.file_count,
+        rep_count=args.file_reps,
+        pipeline_depth=args.pipeline_depth,
+        pool_size=args.pool_size,
         user_id=args.uid,
         group_id=args.gid,
+        timeout=args.timeout,
+        retries=args.retries,
     )
-    # Make sure methods decorated with @nfs_retry() see the new values
-    client.retries = RETRIES
-    client.timeout = TIMEOUT
 
     ################################
 
@@ -382,12 +720,14 @@ if __name__ == "__main__":
     if MODE in ("exec", "exec+verify"):
          run_res = client.run(dir_name=DIR_NAME)
          if run_res != 0:
-             print(f"Error occurred during file operations: {run_res}")
+             log.error("Error occurred during file operations: %s", run_res)
 
     if MODE in ("verify", "exec+verify"):
-        if run_res != 0: 
-            print("run failed")
+        if run_res != 0:
+            log.error("run failed")
         else: 
             client.verify_files(dir_name=DIR_NAME)
     client.unmount()
-    client.cleanup()
\ No newline at end of file
+    client.cleanup()
+    if client.nfs_pool:
+        client.nfs_pool.close()
\ No newline at end of file